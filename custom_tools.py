@@ -4,59 +4,368 @@ Implements DefinitionExpanderTool with Wikipedia API integration.
 """
 
 from smolagents import tool
-import wikipediaapi
+from concurrent.futures import Future, ThreadPoolExecutor
+import asyncio
+import httpx
+import diskcache
+import functools
+import itertools
+import orjson
+import os
+import threading
+import zstandard
 from typing import Optional
 
-# Global Wikipedia API instance
-_wiki = wikipediaapi.Wikipedia(
-    user_agent='AI-Term-Explainer/1.0',
-    language='en'
-)
+# MediaWiki Action API endpoint for English Wikipedia
+_API_URL = "https://en.wikipedia.org/w/api.php"
+
+_HTTP_HEADERS = {"User-Agent": "AI-Term-Explainer/1.0"}
+_HTTP_TIMEOUT = 10.0
+
+# Shared HTTP/2 client so connections are reused and requests multiplexed across lookups
+_http = httpx.Client(http2=True, headers=_HTTP_HEADERS, timeout=_HTTP_TIMEOUT)
 
 # Default max length for truncation
 _MAX_LENGTH = 500
 
+# Number of categories and related terms fetched and shown by get_term_context
+_MAX_CATEGORIES = 5
+_MAX_RELATED_TERMS = 5
 
-@tool
-def fetch_wikipedia_definition(term: str) -> str:
+# On-disk cache shared across runs; bump the version to invalidate old entries.
+# Other caches (e.g. the semantic cache) use subdirectories of CACHE_DIR
+CACHE_DIR = os.path.expanduser("~/.cache/ai_term_explainer")
+_CACHE_VERSION = 4
+_CACHE_TTL = 30 * 24 * 3600  # 30 days
+_NOT_FOUND_TTL = 3600  # 1 hour, so new or renamed pages are picked up soon
+
+# How long Wikimedia's CDN and HTTP caches may reuse an API response. A "missing"
+# answer is cached there too, so this must not outlive the not-found marker
+_EDGE_CACHE_MAXAGE = _NOT_FOUND_TTL
+_CACHE_COMPRESSION_LEVEL = 3
+_cache: Optional[diskcache.Cache] = None
+_cache_lock = threading.Lock()
+
+# Background workers that warm the page cache while the agent is busy with the model
+_PREFETCH_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="wiki-prefetch")
+
+# Page loads in progress, keyed by normalized term, so concurrent callers share one request
+_in_flight: dict[str, Future] = {}
+_in_flight_lock = threading.Lock()
+
+
+def _disk_cache() -> diskcache.Cache:
+    """Open the disk cache on first use, so importing this module creates no files."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = diskcache.Cache(CACHE_DIR)
+    return _cache
+
+
+def _normalize_term(term: str) -> str:
+    """
+    Normalize a term the way Wikipedia normalizes titles: underscores and
+    runs of whitespace become single spaces and only the first letter is
+    case-folded (so "BERT" and "Bert" stay different pages). The result is
+    both the cache key and the title that is fetched.
+    """
+    term = " ".join(term.replace("_", " ").split())
+    return term[:1].upper() + term[1:]
+
+
+def _page_params(selector: dict) -> dict:
     """
-    Fetches the Wikipedia definition for a given AI/ML term.
-    Truncates the text to a manageable length for the LLM.
+    Build the MediaWiki Action API parameters that fetch the summary,
+    categories and links of a page in a single request. The summary is
+    the plain-text lead section from TextExtracts, so no page HTML is
+    transferred or parsed.
     
     Args:
-        term: The AI/ML term to look up (e.g., "cross-entropy loss")
+        selector: Query parameters choosing the page, e.g. titles=...
+            or a search generator (redirects are followed)
+    """
+    return {
+        "action": "query",
+        "format": "json",
+        "formatversion": 2,
+        "redirects": 1,
+        "prop": "extracts|categories|links",
+        "exintro": 1,
+        "explaintext": 1,
+        # Only fetch what get_term_context shows: visible categories and article links
+        "cllimit": _MAX_CATEGORIES,
+        "clshow": "!hidden",
+        "pllimit": _MAX_RELATED_TERMS,
+        "plnamespace": 0,
+        # Let Wikimedia's edge caches serve repeated queries
+        "maxage": _EDGE_CACHE_MAXAGE,
+        "smaxage": _EDGE_CACHE_MAXAGE,
+        **selector,
+    }
+
+
+def _parse_page(data: dict) -> Optional[dict]:
+    """
+    Extract the page data from an API response.
     
     Returns:
-        Truncated Wikipedia definition text
+        Dict with "title", "summary", "categories" and "links",
+        or None if the page does not exist
+    """
+    pages = data.get("query", {}).get("pages", [])
+    if not pages or pages[0].get("missing") or pages[0].get("invalid"):
+        return None
+    
+    page = pages[0]
+    return {
+        "title": page["title"],
+        "summary": page.get("extract", ""),
+        "categories": [cat["title"] for cat in page.get("categories", [])],
+        "links": [link["title"] for link in page.get("links", [])],
+    }
+
+
+def _query_page(**selector) -> Optional[dict]:
+    """Fetch the data of one page (see _page_params and _parse_page)."""
+    response = _http.get(_API_URL, params=_page_params(selector))
+    response.raise_for_status()
+    return _parse_page(orjson.loads(response.content))
+
+
+async def _aquery_page(client: httpx.AsyncClient, **selector) -> Optional[dict]:
+    """Async version of _query_page."""
+    response = await client.get(_API_URL, params=_page_params(selector))
+    response.raise_for_status()
+    return _parse_page(orjson.loads(response.content))
+
+
+def _fetch_page_uncached(term: str) -> Optional[dict]:
     """
+    Fetch the Wikipedia page data for a term. When no page has that
+    exact title, the top full-text search hit is fetched instead, with
+    the search and the page data combined into one extra request.
+    """
+    page = _query_page(titles=term)
+    if page is None:
+        page = _query_page(generator="search", gsrsearch=term, gsrlimit=1)
+    return page
+
+
+async def _afetch_page_uncached(client: httpx.AsyncClient, term: str) -> Optional[dict]:
+    """Async version of _fetch_page_uncached."""
+    page = await _aquery_page(client, titles=term)
+    if page is None:
+        page = await _aquery_page(client, generator="search", gsrsearch=term, gsrlimit=1)
+    return page
+
+
+def _page_key(term: str) -> tuple:
+    """Disk cache key for a term's page data."""
+    return ("page", _CACHE_VERSION, _normalize_term(term))
+
+
+def _not_found_key(term: str) -> tuple:
+    """Disk cache key marking a term for which no page was found."""
+    return ("not_found", _CACHE_VERSION, _normalize_term(term))
+
+
+def _store_page(term: str, page: Optional[dict]) -> None:
+    """Cache fetched page data, or a short-lived marker if nothing was found."""
+    if page is not None:
+        _cache_set(_page_key(term), page, expire=_CACHE_TTL)
+    else:
+        _disk_cache().set(_not_found_key(term), True, expire=_NOT_FOUND_TTL)
+
+
+def _cache_get(key: tuple):
+    """Read a zstd-compressed JSON value from the disk cache (None if missing)."""
+    data = _disk_cache().get(key)
+    if data is None:
+        return None
+    return orjson.loads(zstandard.ZstdDecompressor().decompress(data))
+
+
+def _cache_set(key: tuple, value, expire: float) -> None:
+    """Store a value in the disk cache as zstd-compressed JSON."""
+    # Compressor objects are not thread-safe, so each call gets its own
+    data = zstandard.ZstdCompressor(level=_CACHE_COMPRESSION_LEVEL).compress(orjson.dumps(value))
+    _disk_cache().set(key, data, expire=expire)
+
+
+def _truncate(text: str, max_length: int) -> str:
+    """Truncate text to max_length while preserving word boundaries."""
+    if len(text) <= max_length:
+        return text
+    cut = text.rfind(' ', 0, max_length)
+    if cut <= 0:
+        cut = max_length
+    return text[:cut] + "..."
+
+
+def _load_page(term: str) -> Optional[dict]:
+    """
+    Load page data from the disk cache, fetching it on a miss.
+    Terms recently found to have no page return None without a request.
+    """
+    page = _cache_get(_page_key(term))
+    if page is None and _not_found_key(term) not in _disk_cache():
+        page = _fetch_page_uncached(term)
+        _store_page(term, page)
+    return page
+
+
+def _load_page_single_flight(term: str) -> Optional[dict]:
+    """
+    Load page data, letting concurrent calls for the same term wait for
+    the first caller's result instead of issuing their own request.
+    """
+    key = _normalize_term(term)
+    with _in_flight_lock:
+        future = _in_flight.get(key)
+        is_owner = future is None
+        if is_owner:
+            future = _in_flight[key] = Future()
+    
+    if not is_owner:
+        return future.result()
+    
     try:
-        # Search for the page
-        page = _wiki.page(term)
-        
-        if not page.exists():
-            # Try alternative search using Wikipedia search
-            import wikipedia
-            try:
-                search_results = wikipedia.search(term, results=1)
-                if search_results:
-                    page = _wiki.page(search_results[0])
-                else:
-                    return f"Could not find Wikipedia page for '{term}'. Please try a different term."
-            except Exception:
-                return f"Could not find Wikipedia page for '{term}'. Please try a different term."
-        
-        # Get the summary (first section)
-        summary = page.summary
-        
-        # Truncate to max_length while preserving word boundaries
-        if len(summary) > _MAX_LENGTH:
-            truncated = summary[:_MAX_LENGTH].rsplit(' ', 1)[0]
-            summary = truncated + "..."
+        page = _load_page(term)
+        future.set_result(page)
+        return page
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _in_flight_lock:
+            _in_flight.pop(key, None)
+
+
+class _PageNotFound(Exception):
+    """Raised by _lookup_found_page so that misses are never memoized."""
+
+
+@functools.lru_cache(maxsize=2048)
+def _lookup_found_page(term: str) -> dict:
+    """
+    In-process LRU over pages that exist. lru_cache does not store
+    exceptions, so not-found results are re-checked against the disk
+    cache, whose marker expires after _NOT_FOUND_TTL.
+    """
+    page = _load_page_single_flight(term)
+    if page is None:
+        raise _PageNotFound(term)
+    return page
+
+
+def _lookup_page(term: str) -> Optional[dict]:
+    """
+    Cached page data shared by both tools: an in-process LRU in front
+    of the single-flight disk/network load.
+    
+    Returns:
+        The page data, or None if no page was found
+    """
+    try:
+        return _lookup_found_page(_normalize_term(term))
+    except _PageNotFound:
+        return None
+
+
+def cached_terms() -> list[str]:
+    """Return the normalized terms that currently have a cached Wikipedia page."""
+    return [
+        key[2] for key in _disk_cache().iterkeys()
+        if isinstance(key, tuple) and key[:2] == ("page", _CACHE_VERSION)
+    ]
+
+
+def prefetch_term(term: str) -> Future:
+    """
+    Start loading a term's page in the background, so that a following
+    tool call for the same term is served from the cache (or waits for
+    this load instead of starting its own).
+    
+    Args:
+        term: The AI/ML term to look up
+    
+    Returns:
+        Future resolving to the page data (or None if not found)
+    """
+    key = _normalize_term(term)
+    with _in_flight_lock:
+        future = _in_flight.get(key)
+    if future is not None:
+        return future
+    return _PREFETCH_POOL.submit(_lookup_page, key)
+
+
+async def _aprefetch_page(client: httpx.AsyncClient, term: str) -> None:
+    """Fetch a term's page into the disk cache unless it (or a not-found marker) is already there."""
+    if _page_key(term) not in _disk_cache() and _not_found_key(term) not in _disk_cache():
+        page = await _afetch_page_uncached(client, term)
+        _store_page(term, page)
+
+
+async def prefetch_pages(terms: list[str]) -> None:
+    """
+    Warm the page cache for several terms concurrently, so that the
+    tools only hit the cache afterwards. All requests share one HTTP/2
+    connection. Failed lookups are ignored here and reported by the
+    tools themselves.
+    
+    Args:
+        terms: The AI/ML terms to look up
+    """
+    async with httpx.AsyncClient(http2=True, headers=_HTTP_HEADERS, timeout=_HTTP_TIMEOUT) as client:
+        await asyncio.gather(
+            *(_aprefetch_page(client, _normalize_term(term)) for term in terms),
+            return_exceptions=True,
+        )
+
+
+def make_fetch_tool(max_length: int = _MAX_LENGTH):
+    """
+    Create a fetch_wikipedia_definition tool bound to a truncation length.
+    Each tool keeps its own max_length, so agents with different settings
+    do not affect each other or the shared page cache.
+    
+    Args:
+        max_length: Maximum length of the returned definition text
+    
+    Returns:
+        The fetch_wikipedia_definition tool
+    """
+    @tool
+    def fetch_wikipedia_definition(term: str) -> str:
+        """
+        Fetches the Wikipedia definition for a given AI/ML term.
+        Truncates the text to a manageable length for the LLM.
         
-        return f"Wikipedia definition for '{term}':\n{summary}"
+        Args:
+            term: The AI/ML term to look up (e.g., "cross-entropy loss")
         
-    except Exception as e:
-        return f"Error fetching definition: {str(e)}"
+        Returns:
+            Truncated Wikipedia definition text
+        """
+        try:
+            # Get the summary (first section), served from cache when possible
+            page = _lookup_page(term)
+            if page is None:
+                return f"Could not find Wikipedia page for '{term}'. Please try a different term."
+            summary = _truncate(page["summary"], max_length)
+            return f"Wikipedia definition for '{term}':\n{summary}"
+            
+        except Exception as e:
+            return f"Error fetching definition: {str(e)}"
+    
+    return fetch_wikipedia_definition
+
+
+# Default tool instance, truncating to _MAX_LENGTH
+fetch_wikipedia_definition = make_fetch_tool()
 
 
 @tool
@@ -72,26 +381,17 @@ def get_term_context(term: str) -> str:
         Context information about the term
     """
     try:
-        page = _wiki.page(term)
-        if not page.exists():
-            # Try search using Wikipedia search
-            import wikipedia
-            try:
-                search_results = wikipedia.search(term, results=1)
-                if search_results:
-                    page = _wiki.page(search_results[0])
-                else:
-                    return f"No context found for '{term}'"
-            except Exception:
-                return f"No context found for '{term}'"
+        page = _lookup_page(term)
+        if page is None:
+            return f"No context found for '{term}'"
         
         # Get categories
-        categories = list(page.categories.keys())[:5]
+        categories = itertools.islice(page["categories"], _MAX_CATEGORIES)
         categories_str = ", ".join([cat.split(':')[-1] for cat in categories])
         
         # Get links (related terms)
-        links = list(page.links.keys())[:10]
-        related_terms = ", ".join(links[:5])
+        links = itertools.islice(page["links"], _MAX_RELATED_TERMS)
+        related_terms = ", ".join(links)
         
         return f"Context for '{term}':\nCategories: {categories_str}\nRelated terms: {related_terms}"
         
@@ -106,20 +406,14 @@ class DefinitionExpanderTool:
     The tools are now standalone functions.
     """
     
-    def __init__(self, max_length: int = 500):
+    def __init__(self, max_length: int = _MAX_LENGTH):
         """
         Initialize the tool (for backward compatibility).
         
         Args:
             max_length: Maximum length of text to return (for truncation)
         """
-        global _MAX_LENGTH
-        _MAX_LENGTH = max_length
-    
-    @property
-    def fetch_wikipedia_definition(self):
-        """Return the fetch_wikipedia_definition tool function."""
-        return fetch_wikipedia_definition
+        self.fetch_wikipedia_definition = make_fetch_tool(max_length)
     
     @property
     def get_term_context(self):
@@ -4,86 +4,231 @@ Main implementation of the tool-augmented agent for explaining AI/ML terms.
 """
 
 from smolagents import CodeAgent, LiteLLMModel
-from custom_tools import fetch_wikipedia_definition, get_term_context
+from custom_tools import CACHE_DIR, fetch_wikipedia_definition, get_term_context, prefetch_pages, prefetch_term, cached_terms
+from semantic_cache import SemanticCache
+from term_trie import TermTrie
+import asyncio
+import importlib.util
 import os
+import time
+import urllib.error
+import urllib.request
+import webbrowser
 from dotenv import load_dotenv
 
-# Phoenix integration for observability
-try:
-    import phoenix as px
-    from phoenix.otel import register
-    import webbrowser
-    import time
-    
-    # Launch Phoenix app
-    print("\n" + "="*80)
-    print("🚀 Starting Phoenix for observability...")
-    print("="*80)
-    
-    # Use localhost to avoid IPv6 binding issues
-    session = px.launch_app(host="127.0.0.1", port=6006)
-    
-    # Get Phoenix URL
-    phoenix_url = "http://127.0.0.1:6006"
-    if hasattr(session, 'url'):
-        phoenix_url = session.url
-    elif hasattr(session, 'endpoint'):
-        phoenix_url = session.endpoint
-    
-    # Wait for Phoenix to fully initialize
-    time.sleep(2)
+# Phoenix integration for observability; the packages are only imported
+# by _init_phoenix(), since they are slow to import
+PHOENIX_AVAILABLE = importlib.util.find_spec("phoenix") is not None
+
+# Set by _init_phoenix() when observability is started
+PHOENIX_ENABLED = False
+PHOENIX_SESSION = None
+tracer_provider = None
+
+# Seconds to wait for the Phoenix server to start answering requests
+PHOENIX_STARTUP_TIMEOUT = 10
+
+
+def _wait_for_phoenix(url: str, timeout: float = PHOENIX_STARTUP_TIMEOUT) -> bool:
+    """
+    Poll the Phoenix health endpoint until it returns a 2xx response or the
+    timeout expires.
     
-    # Register Phoenix tracer provider to capture traces
-    print("\n📡 Registering Phoenix tracer provider...")
-    tracer_provider = register(
-        project_name="ai_term_explainer",
-        endpoint=f"{phoenix_url}/v1/traces",
-    )
-    print("✅ Tracer provider registered!")
+    Returns:
+        True if the server reported healthy, False on timeout
+    """
+    health_url = f"{url.rstrip('/')}/healthz"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(health_url, timeout=1) as response:
+                if 200 <= response.status < 300:
+                    return True
+        except (urllib.error.URLError, OSError):
+            # Not listening yet, or an error status (HTTPError is a URLError)
+            pass
+        time.sleep(0.1)
+    return False
+
+
+def _init_phoenix():
+    """
+    Launch the Phoenix app and register OpenTelemetry tracing for LiteLLM.
+    Only called when running main.py directly, so importing this module
+    stays fast. Sets PHOENIX_ENABLED, PHOENIX_SESSION and tracer_provider.
+    """
+    global PHOENIX_ENABLED, PHOENIX_SESSION, tracer_provider
     
-    # Configure LiteLLM to use OpenTelemetry tracing
     try:
-        from openinference.instrumentation.litellm import LiteLLMInstrumentor
-        # Instrument LiteLLM to send traces to Phoenix
-        LiteLLMInstrumentor().instrument(tracer_provider=tracer_provider)
-        print("✅ LiteLLM instrumented with OpenTelemetry!")
-    except ImportError:
-        # Fallback: use environment variables
-        import litellm
-        os.environ["OTEL_SERVICE_NAME"] = "ai_term_explainer"
-        os.environ["OTEL_EXPORTER_OTLP_ENDPOINT"] = f"{phoenix_url}/v1/traces"
-        os.environ["OTEL_EXPORTER_OTLP_PROTOCOL"] = "http/protobuf"
-        print("✅ OpenTelemetry environment configured (using env vars)")
-    
-    print(f"\n✅ Phoenix is running!")
-    print(f"📊 Phoenix UI URL: {phoenix_url}")
-    print(f"\n💡 To view traces:")
-    print(f"   1. Open your web browser")
-    print(f"   2. Go to: {phoenix_url}")
-    print(f"   3. Traces will appear as you use the agent\n")
-    
-    # Try to open browser automatically
+        if not PHOENIX_AVAILABLE:
+            raise ImportError("arize-phoenix is not installed")
+        import phoenix as px
+        from phoenix.otel import register
+        
+        # Launch Phoenix app
+        print("\n" + "="*80)
+        print("🚀 Starting Phoenix for observability...")
+        print("="*80)
+        
+        # Use localhost to avoid IPv6 binding issues
+        session = px.launch_app(host="127.0.0.1", port=6006)
+        
+        # Get Phoenix URL
+        phoenix_url = "http://127.0.0.1:6006"
+        if hasattr(session, 'url'):
+            phoenix_url = session.url
+        elif hasattr(session, 'endpoint'):
+            phoenix_url = session.endpoint
+        
+        # Wait for Phoenix to fully initialize
+        if not _wait_for_phoenix(phoenix_url):
+            print(f"⚠️  Phoenix did not respond within {PHOENIX_STARTUP_TIMEOUT}s, continuing anyway")
+        
+        # Register Phoenix tracer provider to capture traces
+        print("\n📡 Registering Phoenix tracer provider...")
+        tracer_provider = register(
+            project_name="ai_term_explainer",
+            endpoint=f"{phoenix_url}/v1/traces",
+        )
+        print("✅ Tracer provider registered!")
+        
+        # Configure LiteLLM to use OpenTelemetry tracing
+        try:
+            from openinference.instrumentation.litellm import LiteLLMInstrumentor
+            # Instrument LiteLLM to send traces to Phoenix
+            LiteLLMInstrumentor().instrument(tracer_provider=tracer_provider)
+            print("✅ LiteLLM instrumented with OpenTelemetry!")
+        except ImportError:
+            # Fallback: use environment variables
+            import litellm
+            os.environ["OTEL_SERVICE_NAME"] = "ai_term_explainer"
+            os.environ["OTEL_EXPORTER_OTLP_ENDPOINT"] = f"{phoenix_url}/v1/traces"
+            os.environ["OTEL_EXPORTER_OTLP_PROTOCOL"] = "http/protobuf"
+            print("✅ OpenTelemetry environment configured (using env vars)")
+        
+        print(f"\n✅ Phoenix is running!")
+        print(f"📊 Phoenix UI URL: {phoenix_url}")
+        print(f"\n💡 To view traces:")
+        print(f"   1. Open your web browser")
+        print(f"   2. Go to: {phoenix_url}")
+        print(f"   3. Traces will appear as you use the agent\n")
+        
+        # Try to open browser automatically
+        try:
+            webbrowser.open(phoenix_url)
+            print(f"🌐 Attempted to open browser automatically")
+            print(f"   If it didn't open, manually visit: {phoenix_url}\n")
+        except Exception as browser_error:
+            print(f"⚠️  Could not open browser automatically")
+            print(f"   Please manually open: {phoenix_url}\n")
+        
+        PHOENIX_ENABLED = True
+        PHOENIX_SESSION = session
+    except Exception as e:
+        print(f"⚠️  Phoenix not available: {e}")
+        import traceback
+        traceback.print_exc()
+        print("Continuing without Phoenix observability...\n")
+        PHOENIX_ENABLED = False
+        PHOENIX_SESSION = None
+        tracer_provider = None
+
+
+def _close_phoenix():
+    """Shut down the Phoenix app if _init_phoenix() started it."""
+    if not PHOENIX_ENABLED:
+        return
     try:
-        webbrowser.open(phoenix_url)
-        print(f"🌐 Attempted to open browser automatically")
-        print(f"   If it didn't open, manually visit: {phoenix_url}\n")
-    except Exception as browser_error:
-        print(f"⚠️  Could not open browser automatically")
-        print(f"   Please manually open: {phoenix_url}\n")
-    
-    PHOENIX_ENABLED = True
-    PHOENIX_SESSION = session
-except Exception as e:
-    print(f"⚠️  Phoenix not available: {e}")
-    import traceback
-    traceback.print_exc()
-    print("Continuing without Phoenix observability...\n")
-    PHOENIX_ENABLED = False
-    PHOENIX_SESSION = None
-    tracer_provider = None
+        import phoenix as px
+        px.close_app()
+    except Exception:
+        pass
+
 
 load_dotenv()
 
+# Maximum concurrent LLM requests in batch mode (keeps free tiers like Groq under their rate limits)
+BATCH_CONCURRENCY = 5
+
+# Reuses explanations for paraphrased terms (no-op without the optional dependencies)
+_semantic_cache = SemanticCache(os.path.join(CACHE_DIR, "semantic"))
+
+LEVEL_INSTRUCTIONS = {
+    "beginner": "Simple analogies, no jargon, explain as if to a complete beginner",
+    "intermediate": "Technical details, basic math, assume basic AI/ML knowledge",
+    "expert": "Deep technical, mathematical formulations, implementation details"
+}
+
+# Prompt templates, built once so every call sends the same text apart from the
+# substituted fields (lets providers with prompt caching reuse the shared parts)
+PROMPT_ALL = """
+        Explain the AI/ML term "{term}" at three difficulty levels:
+        
+        1. BEGINNER level: Explain it as if the reader has no prior knowledge of AI/ML.
+           Use simple analogies and avoid technical jargon.
+        
+        2. INTERMEDIATE level: Explain it for someone with basic AI/ML knowledge.
+           Include technical details and mathematical concepts where relevant.
+        
+        3. EXPERT level: Provide a deep, technical explanation suitable for researchers.
+           Include mathematical formulations, implementation details, and connections to related concepts.
+        
+        First, use the fetch_wikipedia_definition tool to get the base definition.
+        Then, use your knowledge to expand and adapt it to each difficulty level.
+        
+        CRITICAL INSTRUCTIONS:
+        - Create all THREE explanations (beginner, intermediate, expert)
+        - Format them as a single combined response with clear section headers:
+          
+          BEGINNER LEVEL:
+          [your beginner explanation here]
+          
+          INTERMEDIATE LEVEL:
+          [your intermediate explanation here]
+          
+          EXPERT LEVEL:
+          [your expert explanation here]
+        
+        - Call final_answer() EXACTLY ONCE with the complete formatted response containing all three levels
+        - Do NOT call final_answer() multiple times - combine everything into one answer
+        """
+
+PROMPT_SINGLE = """
+        Explain the AI/ML term "{term}" at the {level} level.
+        
+        First, use the fetch_wikipedia_definition tool to get the base definition.
+        Then, adapt it to the {difficulty} level: {instructions}
+        
+        Provide a clear, structured explanation.
+        """
+
+# Used by explain_terms(), which inlines the definition instead of calling tools
+PROMPT_BATCH = """
+        Explain the AI/ML term "{term}" {task}
+        
+        Base your explanation on this definition, expanding it with your own knowledge:
+        {definition}
+        
+        Provide a clear, structured explanation.
+        """
+
+# Used by explain_terms() when no Wikipedia definition could be fetched for a term
+PROMPT_BATCH_NO_DEFINITION = """
+        Explain the AI/ML term "{term}" {task}
+        
+        No reference definition is available, so rely on your own knowledge.
+        
+        Provide a clear, structured explanation.
+        """
+
+# Prefix of a successful fetch_wikipedia_definition result (errors and misses differ)
+_DEFINITION_PREFIX = "Wikipedia definition for"
+
+_BATCH_TASK_ALL = "at three difficulty levels, each under its own header:\n" + "\n".join(
+    f"        {level.upper()} LEVEL: {instructions}"
+    for level, instructions in LEVEL_INSTRUCTIONS.items()
+)
+
 
 def create_ai_term_explainer_agent():
     """
@@ -160,58 +305,140 @@ def explain_term(agent, term: str, difficulty: str = "all"):
     Returns:
         Explanation string
     """
+    # Fetch the Wikipedia page while the semantic lookup (which may load the
+    # embedding model) and the model's first step run; on a hit it only warms the cache
+    prefetch_term(term)
+    
+    cached = _semantic_cache.get(term, difficulty)
+    if cached is not None:
+        return cached
+    
     if difficulty == "all":
-        prompt = f"""
-        Explain the AI/ML term "{term}" at three difficulty levels:
-        
-        1. BEGINNER level: Explain it as if the reader has no prior knowledge of AI/ML.
-           Use simple analogies and avoid technical jargon.
-        
-        2. INTERMEDIATE level: Explain it for someone with basic AI/ML knowledge.
-           Include technical details and mathematical concepts where relevant.
-        
-        3. EXPERT level: Provide a deep, technical explanation suitable for researchers.
-           Include mathematical formulations, implementation details, and connections to related concepts.
-        
-        First, use the fetch_wikipedia_definition tool to get the base definition.
-        Then, use your knowledge to expand and adapt it to each difficulty level.
-        
-        CRITICAL INSTRUCTIONS:
-        - Create all THREE explanations (beginner, intermediate, expert)
-        - Format them as a single combined response with clear section headers:
-          
-          BEGINNER LEVEL:
-          [your beginner explanation here]
-          
-          INTERMEDIATE LEVEL:
-          [your intermediate explanation here]
-          
-          EXPERT LEVEL:
-          [your expert explanation here]
-        
-        - Call final_answer() EXACTLY ONCE with the complete formatted response containing all three levels
-        - Do NOT call final_answer() multiple times - combine everything into one answer
-        """
+        prompt = PROMPT_ALL.format(term=term)
     else:
-        level_instructions = {
-            "beginner": "Simple analogies, no jargon, explain as if to a complete beginner",
-            "intermediate": "Technical details, basic math, assume basic AI/ML knowledge",
-            "expert": "Deep technical, mathematical formulations, implementation details"
-        }
-        
-        prompt = f"""
-        Explain the AI/ML term "{term}" at the {difficulty.upper()} level.
-        
-        First, use the fetch_wikipedia_definition tool to get the base definition.
-        Then, adapt it to the {difficulty} level: {level_instructions.get(difficulty, "")}
-        
-        Provide a clear, structured explanation.
-        """
+        prompt = PROMPT_SINGLE.format(
+            term=term,
+            level=difficulty.upper(),
+            difficulty=difficulty,
+            instructions=LEVEL_INSTRUCTIONS.get(difficulty, ""),
+        )
     
     result = agent.run(prompt)
+    if _is_cacheable(term, difficulty, result):
+        _semantic_cache.add(term, difficulty, str(result))
     return result
 
 
+def _is_cacheable(term: str, difficulty: str, result) -> bool:
+    """
+    Check whether an agent result is good enough to store in the semantic
+    cache, where it would be reused for every similar term.
+    
+    Rejects empty answers, "all"-level answers missing one of the level
+    sections (e.g. a partial answer forced out at max_steps), and answers
+    written without a Wikipedia definition to ground them.
+    """
+    text = str(result).strip()
+    if not text:
+        return False
+    if difficulty == "all" and not all(f"{level.upper()} LEVEL" in text.upper() for level in LEVEL_INSTRUCTIONS):
+        return False
+    # Served from the page cache; error and not-found messages have other prefixes
+    return fetch_wikipedia_definition(term).startswith(_DEFINITION_PREFIX)
+
+
+def explain_terms(agent, terms: list[str], difficulty: str = "all") -> list[str]:
+    """
+    Explain several AI/ML terms in one batch.
+    
+    Bypasses the agent loop: all Wikipedia definitions are fetched up front
+    and inlined into the prompts, then the agent's model is called for all
+    terms concurrently (at most BATCH_CONCURRENCY requests at a time).
+    
+    Args:
+        agent: The CodeAgent instance (only its model is used)
+        terms: The AI/ML terms to explain
+        difficulty: "beginner", "intermediate", "expert", or "all"
+    
+    Returns:
+        List of explanation strings, in the same order as terms
+    
+    Uses asyncio.run(), so it cannot be called while an event loop is
+    already running (e.g. in Jupyter); await explain_terms_async() there.
+    """
+    return asyncio.run(explain_terms_async(agent, terms, difficulty))
+
+
+async def explain_terms_async(agent, terms: list[str], difficulty: str = "all") -> list[str]:
+    """
+    Coroutine version of explain_terms(), for callers with a running event loop.
+    
+    Args:
+        agent: The CodeAgent instance (only its model is used)
+        terms: The AI/ML terms to explain
+        difficulty: "beginner", "intermediate", "expert", or "all"
+    
+    Returns:
+        List of explanation strings, in the same order as terms
+    """
+    model = agent.model
+    await prefetch_pages(terms)
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    
+    async def explain_one(term: str) -> str:
+        # Usually served from the cache warmed by prefetch_pages; a failed
+        # prefetch retries over the network, so keep it off the event loop
+        definition = await asyncio.to_thread(fetch_wikipedia_definition, term)
+        if difficulty == "all":
+            task = _BATCH_TASK_ALL
+        else:
+            task = f"at the {difficulty.upper()} level: {LEVEL_INSTRUCTIONS.get(difficulty, '')}"
+        if definition.startswith(_DEFINITION_PREFIX):
+            prompt = PROMPT_BATCH.format(term=term, task=task, definition=definition)
+        else:
+            # Not found or fetch failed: don't present the error text as a definition
+            prompt = PROMPT_BATCH_NO_DEFINITION.format(term=term, task=task)
+        messages = [{"role": "user", "content": [{"type": "text", "text": prompt}]}]
+        try:
+            async with semaphore:
+                response = await asyncio.to_thread(model, messages)
+            return response.content
+        except Exception as e:
+            return f"Error explaining '{term}': {str(e)}"
+    
+    return await asyncio.gather(*(explain_one(term) for term in terms))
+
+
+def _resolve_term(trie: TermTrie, term: str) -> str:
+    """
+    Map a typed term onto a previously seen spelling so it hits the caches.
+    Spelling variants of a known term are replaced silently; otherwise up to
+    five completions are offered and the user may pick one.
+    
+    Args:
+        trie: Trie of previously seen terms
+        term: The term entered by the user
+    
+    Returns:
+        The term to explain
+    """
+    known = trie.get(term)
+    if known:
+        return known
+    
+    suggestions = trie.completions(term)
+    if not suggestions:
+        return term
+    
+    print("Did you mean:")
+    for i, suggestion in enumerate(suggestions, 1):
+        print(f"  {i}. {suggestion}")
+    choice = input(f"Pick a number, or press Enter to keep '{term}': ").strip()
+    if choice.isdigit() and 1 <= int(choice) <= len(suggestions):
+        return suggestions[int(choice) - 1]
+    return term
+
+
 def interactive_mode(agent):
     """
     Interactive mode where users can query terms and provide feedback.
@@ -222,6 +449,9 @@ def interactive_mode(agent):
     print("Enter an AI/ML term to get explanations at 3 difficulty levels.")
     print("Type 'quit' to exit.\n")
     
+    # Previously looked-up terms, for suggestions and spelling normalization
+    trie = TermTrie(cached_terms())
+    
     while True:
         term = input("\nEnter an AI/ML term: ").strip()
         
@@ -232,6 +462,8 @@ def interactive_mode(agent):
         if not term:
             continue
         
+        term = _resolve_term(trie, term)
+        
         print(f"\n{'='*80}")
         print(f"Explaining: {term}")
         print('='*80)
@@ -239,6 +471,7 @@ def interactive_mode(agent):
         try:
             result = explain_term(agent, term, difficulty="all")
             print(f"\n{result}\n")
+            trie.add(term)
             
             # Human-in-the-loop: Ask for feedback
             feedback = input("Was this explanation helpful? (yes/no/skip): ").strip().lower()
@@ -255,6 +488,8 @@ def interactive_mode(agent):
 
 
 if __name__ == "__main__":
+    _init_phoenix()
+    
     try:
         # Create agent
         print("Initializing AI Term Explainer Agent...")
@@ -265,17 +500,9 @@ if __name__ == "__main__":
         interactive_mode(agent)
     except KeyboardInterrupt:
         print("\n\nShutting down...")
-        if PHOENIX_ENABLED:
-            try:
-                px.close_app()
-            except:
-                pass
+        _close_phoenix()
     except Exception as e:
         print(f"\nError: {e}")
-        if PHOENIX_ENABLED:
-            try:
-                px.close_app()
-            except:
-                pass
+        _close_phoenix()
         raise
 
@@ -0,0 +1,152 @@
+"""
+Semantic cache for the AI Term Explainer agent.
+Reuses explanations for differently worded queries of the same concept
+(e.g. "cross entropy" and "cross-entropy loss") by comparing sentence
+embeddings in a FAISS index.
+
+Requires the optional sentence-transformers and faiss-cpu packages;
+without them the cache is disabled and every lookup is a miss.
+"""
+
+import importlib.util
+import json
+import os
+from typing import Optional
+
+# The optional packages (torch and friends) are slow to import, so only
+# check for them here; SemanticCache._load() imports them on first use
+SEMANTIC_CACHE_AVAILABLE = all(
+    importlib.util.find_spec(name) is not None
+    for name in ("faiss", "numpy", "sentence_transformers")
+)
+
+# Small, fast embedding model; good enough for short AI/ML terms
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Minimum cosine similarity for two terms to share an explanation
+SIMILARITY_THRESHOLD = 0.95
+
+# Number of nearest neighbours checked for an entry with the same difficulty
+_SEARCH_K = 5
+
+
+class SemanticCache:
+    """
+    Explanation cache keyed by embedding similarity of the term.
+
+    Embeddings are stored normalized in an inner-product FAISS index, so
+    search scores are cosine similarities. A parallel list holds the term,
+    difficulty and explanation for each indexed vector. Both are persisted
+    to the cache directory after every insert.
+    """
+
+    def __init__(self, cache_dir: str, threshold: float = SIMILARITY_THRESHOLD):
+        """
+        Initialize the cache. The embedding model and index are loaded
+        lazily on first use.
+
+        Args:
+            cache_dir: Directory (owned by this cache) for the persisted index and entries
+            threshold: Minimum cosine similarity for a cache hit
+        """
+        self.threshold = threshold
+        self.enabled = SEMANTIC_CACHE_AVAILABLE
+        self._index_path = os.path.join(cache_dir, "semantic.faiss")
+        self._entries_path = os.path.join(cache_dir, "semantic.json")
+        self._model = None
+        self._index = None
+        self._entries = []
+        # Embedding of the last term passed to get(), reused by a following add()
+        self._last_embedding = None
+
+    def _load(self) -> bool:
+        """Load the model and the persisted index; returns whether the cache is usable."""
+        if not self.enabled:
+            return False
+        if self._model is not None:
+            return True
+        try:
+            import faiss
+            from sentence_transformers import SentenceTransformer
+
+            self._model = SentenceTransformer(EMBEDDING_MODEL)
+            dimension = self._model.get_sentence_embedding_dimension()
+            self._index = faiss.IndexFlatIP(dimension)
+            self._entries = []
+            if os.path.exists(self._index_path) and os.path.exists(self._entries_path):
+                index = faiss.read_index(self._index_path)
+                with open(self._entries_path, encoding="utf-8") as f:
+                    entries = json.load(f)
+                # A crash between the two writes leaves them out of sync; start over then
+                if index.ntotal == len(entries) and index.d == dimension:
+                    self._index, self._entries = index, entries
+        except Exception as e:
+            print(f"⚠️  Semantic cache disabled: {e}")
+            self.enabled = False
+            self._model = None
+            return False
+        return True
+
+    def _embed(self, term: str):
+        """
+        Return the normalized embedding of a term as a (1, dim) float32 array.
+        The last result is remembered, so add() after a missed get() for the
+        same term does not encode it again.
+        """
+        import numpy as np
+
+        key = term.strip().lower()
+        if self._last_embedding is not None and self._last_embedding[0] == key:
+            return self._last_embedding[1]
+        vector = self._model.encode([key], normalize_embeddings=True)
+        vector = np.asarray(vector, dtype="float32")
+        self._last_embedding = (key, vector)
+        return vector
+
+    def get(self, term: str, difficulty: str) -> Optional[str]:
+        """
+        Look up a cached explanation for a similar term.
+
+        Args:
+            term: The AI/ML term being explained
+            difficulty: The requested difficulty level
+
+        Returns:
+            The cached explanation, or None on a miss
+        """
+        if not self._load() or self._index.ntotal == 0:
+            return None
+        scores, ids = self._index.search(self._embed(term), min(_SEARCH_K, self._index.ntotal))
+        for score, idx in zip(scores[0], ids[0]):
+            if score < self.threshold:
+                break
+            if not 0 <= idx < len(self._entries):
+                continue
+            entry = self._entries[idx]
+            if entry["difficulty"] == difficulty:
+                return entry["result"]
+        return None
+
+    def add(self, term: str, difficulty: str, result: str) -> None:
+        """
+        Store an explanation and persist the cache.
+
+        Args:
+            term: The AI/ML term that was explained
+            difficulty: The difficulty level of the explanation
+            result: The explanation text
+        """
+        if not self._load():
+            return
+        import faiss
+
+        self._index.add(self._embed(term))
+        self._entries.append({"term": term, "difficulty": difficulty, "result": result})
+
+        # Write to temporary files and rename, so a crash never leaves a partial file
+        os.makedirs(os.path.dirname(self._index_path), exist_ok=True)
+        faiss.write_index(self._index, self._index_path + ".tmp")
+        with open(self._entries_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self._entries, f)
+        os.replace(self._index_path + ".tmp", self._index_path)
+        os.replace(self._entries_path + ".tmp", self._entries_path)
@@ -0,0 +1,88 @@
+"""
+Prefix trie over previously seen AI/ML terms.
+Used by interactive mode for typeahead suggestions and to map spelling
+variants ("cross-entropy", "cross entropy", "crossentropy") onto one term.
+"""
+
+import re
+from typing import Optional
+
+# Only separators are folded; other symbols carry meaning ("C", "C#", "C++")
+_SEPARATORS = re.compile(r"[\s_-]+")
+
+
+def canonical_term(term: str) -> str:
+    """Lowercase a term and drop whitespace, hyphens and underscores."""
+    return _SEPARATORS.sub("", term.lower())
+
+
+class TermTrie:
+    """
+    Character trie keyed by canonical term. Each terminal node keeps the
+    first spelling seen for that key, which is what lookups return.
+    """
+
+    def __init__(self, terms: Optional[list[str]] = None):
+        """
+        Initialize the trie.
+
+        Args:
+            terms: Terms to insert up front
+        """
+        self._root = {}
+        for term in terms or []:
+            self.add(term)
+
+    def add(self, term: str) -> None:
+        """Insert a term, keeping any existing spelling for the same canonical key."""
+        key = canonical_term(term)
+        if not key:
+            return
+        node = self._root
+        for char in key:
+            node = node.setdefault(char, {})
+        node.setdefault(None, term.strip())
+
+    def _find(self, key: str) -> Optional[dict]:
+        """Return the node reached by walking key, or None."""
+        node = self._root
+        for char in key:
+            node = node.get(char)
+            if node is None:
+                return None
+        return node
+
+    def get(self, term: str) -> Optional[str]:
+        """Return the stored spelling of a term with the same canonical key, if any."""
+        key = canonical_term(term)
+        node = self._find(key) if key else None
+        return node.get(None) if node else None
+
+    def completions(self, prefix: str, limit: int = 5) -> list[str]:
+        """
+        List stored terms whose canonical key starts with the prefix.
+
+        Args:
+            prefix: The (partial) term typed by the user
+            limit: Maximum number of completions to return
+
+        Returns:
+            Up to limit stored spellings, shortest keys first
+        """
+        key = canonical_term(prefix)
+        node = self._find(key) if key else None
+        if node is None:
+            return []
+        results = []
+        level = [node]
+        # Breadth-first so that shorter (closer) completions come first
+        while level and len(results) < limit:
+            next_level = []
+            for current in level:
+                for char, child in sorted(current.items(), key=lambda item: item[0] or ""):
+                    if char is None:
+                        results.append(child)
+                    else:
+                        next_level.append(child)
+            level = next_level
+        return results[:limit]
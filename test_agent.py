@@ -3,7 +3,10 @@ Test script for the AI Term Explainer agent.
 Tests the agent with various AI/ML terms.
 """
 
-from main import create_ai_term_explainer_agent, explain_term
+import asyncio
+
+from main import create_ai_term_explainer_agent, explain_term, explain_terms
+from custom_tools import prefetch_pages
 
 
 def test_agent():
@@ -20,6 +23,10 @@ def test_agent():
         "backpropagation"
     ]
     
+    # Fetch all Wikipedia pages concurrently up front
+    print("Prefetching Wikipedia pages...")
+    asyncio.run(prefetch_pages(test_terms))
+    
     for i, term in enumerate(test_terms, 1):
         print(f"\n{'='*80}")
         print(f"Test {i}/{len(test_terms)}: {term}")
@@ -34,6 +41,29 @@ def test_agent():
             print("-"*80)
 
 
+def test_agent_batch():
+    """Test batch mode, which explains all terms with concurrent model calls."""
+    print("Initializing agent...")
+    agent = create_ai_term_explainer_agent()
+    print("Agent ready!\n")
+    
+    test_terms = [
+        "cross-entropy loss",
+        "attention mechanism",
+        "gradient descent",
+        "transformer architecture",
+        "backpropagation"
+    ]
+    
+    results = explain_terms(agent, test_terms, difficulty="all")
+    for i, (term, result) in enumerate(zip(test_terms, results), 1):
+        print(f"\n{'='*80}")
+        print(f"Test {i}/{len(test_terms)}: {term}")
+        print('='*80)
+        print(result)
+        print("\n" + "-"*80)
+
+
 if __name__ == "__main__":
     test_agent()
 
@@ -0,0 +1,167 @@
+"""
+Offline tests for the AI Term Explainer helpers.
+Covers logic that does not need network access or API keys. Importing
+custom_tools needs its dependencies installed but creates no cache files.
+"""
+
+import contextlib
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from term_trie import TermTrie, canonical_term
+
+
+@contextlib.contextmanager
+def _isolated_tools(fetch):
+    """Point custom_tools at a temporary disk cache and a fake page fetcher."""
+    import custom_tools
+    import diskcache
+
+    saved = custom_tools._cache, custom_tools._fetch_page_uncached
+    with tempfile.TemporaryDirectory() as cache_dir:
+        custom_tools._cache = diskcache.Cache(cache_dir)
+        custom_tools._fetch_page_uncached = fetch
+        custom_tools._lookup_found_page.cache_clear()
+        try:
+            yield custom_tools
+        finally:
+            custom_tools._cache.close()
+            custom_tools._cache, custom_tools._fetch_page_uncached = saved
+            custom_tools._lookup_found_page.cache_clear()
+
+
+def _fake_page(term):
+    """Page data in the shape returned by the real fetcher."""
+    return {"title": term, "summary": f"{term} summary", "categories": [], "links": []}
+
+
+def test_canonical_term():
+    """Only case, whitespace, hyphens and underscores are folded."""
+    assert canonical_term("Cross-Entropy") == "crossentropy"
+    assert canonical_term("cross entropy") == canonical_term("cross_entropy") == "crossentropy"
+    assert canonical_term("C++") != canonical_term("C#")
+    assert canonical_term("C") != canonical_term("C++")
+
+
+def test_trie_get():
+    """Spelling variants map to the first stored spelling; other terms do not."""
+    trie = TermTrie(["cross-entropy loss", "c++", "c#"])
+    trie.add("Cross Entropy Loss")
+    assert trie.get("crossentropy  loss") == "cross-entropy loss"
+    assert trie.get("C++") == "c++"
+    assert trie.get("C") is None
+    assert trie.get("cross") is None
+    assert trie.get("") is None
+
+
+def test_trie_completions():
+    """Completions are breadth-first (shortest first) and limited."""
+    trie = TermTrie(["gradient descent", "gradient", "gradient boosting", "attention"])
+    assert trie.completions("grad") == ["gradient", "gradient descent", "gradient boosting"]
+    assert trie.completions("grad", limit=2) == ["gradient", "gradient descent"]
+    assert trie.completions("xyz") == []
+    assert trie.completions("") == []
+
+
+def test_truncate():
+    """Definitions are cut at the last word boundary before max_length."""
+    from custom_tools import _truncate
+
+    assert _truncate("short text", 50) == "short text"
+    assert _truncate("aaa bbb ccc ddd", 8) == "aaa bbb..."
+    assert _truncate("aaa bbb ccc ddd", 7) == "aaa..."
+    # No space to cut at: hard cut at max_length
+    assert _truncate("abcdefghij", 4) == "abcd..."
+
+
+def _run_concurrently(tools, fetch_started, release, callers=8):
+    """
+    Start several single-flight loads of one term, wait until they are all
+    queued behind the first, then let the fetch finish.
+    """
+    pool = ThreadPoolExecutor(max_workers=callers)
+    futures = [pool.submit(tools._load_page_single_flight, "Gradient descent") for _ in range(callers)]
+    assert fetch_started.wait(5)
+    # Give the other callers time to find the in-flight load and wait on it
+    time.sleep(0.2)
+    release.set()
+    pool.shutdown(wait=True)
+    return futures
+
+
+def test_single_flight():
+    """Concurrent loads of one term share a single upstream fetch, including its failure."""
+    calls = []
+    fetch_started, release = threading.Event(), threading.Event()
+
+    def fetch(term):
+        calls.append(term)
+        fetch_started.set()
+        release.wait(5)
+        return _fake_page(term)
+
+    with _isolated_tools(fetch) as tools:
+        futures = _run_concurrently(tools, fetch_started, release)
+        results = [future.result() for future in futures]
+        assert len(calls) == 1
+        assert all(result == _fake_page("Gradient descent") for result in results)
+        assert tools._in_flight == {}
+
+    calls.clear()
+    fetch_started.clear()
+    release.clear()
+
+    def failing_fetch(term):
+        calls.append(term)
+        fetch_started.set()
+        release.wait(5)
+        raise RuntimeError("upstream failed")
+
+    with _isolated_tools(failing_fetch) as tools:
+        futures = _run_concurrently(tools, fetch_started, release)
+        assert len(calls) == 1
+        for future in futures:
+            assert isinstance(future.exception(), RuntimeError)
+        assert tools._in_flight == {}
+
+
+def test_not_found_marker():
+    """Misses are not memoized in-process; the disk marker suppresses refetches until it expires."""
+    calls = []
+    found = []
+
+    def fetch(term):
+        calls.append(term)
+        return _fake_page(term) if found else None
+
+    with _isolated_tools(fetch) as tools:
+        saved_ttl = tools._NOT_FOUND_TTL
+        tools._NOT_FOUND_TTL = 0.3
+        try:
+            assert tools._lookup_page("xyzzy") is None
+            assert len(calls) == 1
+            assert tools._lookup_found_page.cache_info().currsize == 0
+
+            # Within the TTL the marker answers without a request
+            assert tools._lookup_page("xyzzy") is None
+            assert len(calls) == 1
+
+            # Once it expires the page is fetched again and now found
+            found.append(True)
+            time.sleep(0.5)
+            assert tools._lookup_page("xyzzy") == _fake_page("Xyzzy")
+            assert len(calls) == 2
+        finally:
+            tools._NOT_FOUND_TTL = saved_ttl
+
+
+if __name__ == "__main__":
+    test_canonical_term()
+    test_trie_get()
+    test_trie_completions()
+    test_truncate()
+    test_single_flight()
+    test_not_found_marker()
+    print("All offline tests passed.")